@@ -1,25 +1,104 @@
 import os
 import re
+import string
+import sys
+import queue
+import atexit
+import logging
+import logging.handlers
 import threading
 import time
 import functools
 import concurrent.futures
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, Tag
 import google.generativeai as genai
-from flask import Flask, request, Response, jsonify, make_response
+from flask import Flask, request, Response, g, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
 from dotenv import load_dotenv
 import json
 import uuid
+import hashlib
+import copy
+from collections import deque
 import tldextract  # New import for domain reputation checking
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+
+# Log through a queue so request threads never wait on stderr; a listener thread does the writing
+logger = logging.getLogger(__name__)
+logger.propagate = False
+log_queue = queue.Queue(-1)
+log_stream_handler = logging.StreamHandler(sys.stderr)
+log_stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(threadName)s] %(message)s"))
+log_listener = logging.handlers.QueueListener(log_queue, log_stream_handler)
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# Prefer the C-based lxml parser for BeautifulSoup, falling back to the pure-Python one
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Prefer the Rust-based orjson for JSON parsing/serialization, falling back to the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_loads(text):
+    """Parse JSON with orjson when available (its JSONDecodeError subclasses json.JSONDecodeError)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes and parses with orjson."""
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 # Load environment variables
 load_dotenv()
 
+# Log level comes from the environment (or .env); unknown names fall back to INFO
+log_level = logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper())
+logger.setLevel(log_level if isinstance(log_level, int) else logging.INFO)
+
 # Initialize Flask app
 app = Flask(__name__)
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+
+def ojsonify(obj, status=200):
+    """Build a JSON response, handing orjson's bytes straight to the Response."""
+    if orjson is not None:
+        body = orjson.dumps(obj, default=app.json.default, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        body = app.json.dumps(obj)
+    return Response(body, status=status, mimetype='application/json')
+
+def json_body():
+    """Parse a JSON request body with json_loads; None when it isn't JSON or doesn't parse (like get_json(silent=True))."""
+    # Only JSON bodies are read, so form posts keep their stream for request.form
+    if not request.is_json:
+        return None
+    raw = request.get_data(cache=False)
+    if not raw:
+        return None
+    try:
+        return json_loads(raw)
+    except ValueError:
+        return None
 app.secret_key = os.getenv("SECRET_KEY", os.urandom(24))  # Add a secret key for sessions
 # Allow all origins for development, but you can restrict this in production
 CORS(app, resources={r"/*": {"origins": "*"}})
@@ -27,24 +106,120 @@ CORS(app, resources={r"/*": {"origins": "*"}})
 # Get Gemini API key from environment
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
 if not GEMINI_API_KEY:
-    print("⚠️ WARNING: GEMINI_API_KEY not found in environment variables.")
+    logger.warning("⚠️ WARNING: GEMINI_API_KEY not found in environment variables.")
     raise ValueError("❌ ERROR: Missing Gemini API Key in .env file!")
 
-# Simple in-memory cache for website content
-website_content_cache = {}
-# Create a dictionary to store session-specific data
-session_data = {}
-lock = threading.Lock()  # Prevent concurrency issues
+# Bounded in-memory cache for website content (LRU eviction + TTL expiry)
+website_content_cache = TTLCache(maxsize=512, ttl=600)
+website_content_lock = threading.RLock()
+# Upper bound on how much of a page we download before parsing
+MAX_CONTENT_BYTES = 2_000_000
+# Visible text sent to Gemini (increased from 10000 to 20000 for better analysis)
+MAX_TEXT_CHARS = 20000
+
+# Shared HTTP session so page fetches reuse pooled keep-alive connections
+http_session = requests.Session()
+http_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+)
+http_session.mount('http://', http_adapter)
+http_session.mount('https://', http_adapter)
+
+# Completed analyses, keyed by model and normalized URL, so repeat requests skip fetch + Gemini
+ANALYSIS_CACHE_TTL = 3600
+analysis_cache = TTLCache(maxsize=1024, ttl=ANALYSIS_CACHE_TTL)
+analysis_cache_lock = threading.Lock()
+
+# Worker pool for short background tasks off the request thread (e.g. the Gemini connection warm-up)
+scrape_executor = concurrent.futures.ThreadPoolExecutor(max_workers=16, thread_name_prefix="scrape")
+
+# Background analyses requested with ?async=1, polled by job id
+ANALYSIS_JOB_TTL = 3600
+analysis_executor = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="analysis")
+analysis_jobs = TTLCache(maxsize=4096, ttl=ANALYSIS_JOB_TTL)
+analysis_jobs_lock = threading.Lock()
+
+class SessionStore:
+    """Per-session TTL cache split into shards, each with its own lock, so unrelated sessions don't contend."""
+    def __init__(self, maxsize, ttl, shards=32):
+        self._shards = [(TTLCache(maxsize=max(1, maxsize // shards), ttl=ttl), threading.Lock())
+                        for _ in range(shards)]
+
+    def _shard(self, session_id):
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    def get_or_create(self, session_id, factory):
+        """Return the value for a session, storing factory() first if it is missing or expired."""
+        cache, shard_lock = self._shard(session_id)
+        with shard_lock:
+            value = cache.get(session_id)
+            if value is None:
+                value = cache[session_id] = factory()
+            return value
+
+# Session-specific data and chat histories, bounded in size and expired after 1 hour
+# (TTLCache evicts expired entries lazily on insert, so no periodic sweep is needed)
+SESSION_TTL_SECONDS = 3600
+session_data = SessionStore(maxsize=10_000, ttl=SESSION_TTL_SECONDS)
+chat_histories = SessionStore(maxsize=10_000, ttl=SESSION_TTL_SECONDS)
+MAX_CHAT_HISTORY_MESSAGES = 20  # Older messages drop off the bounded history deque
+CHAT_CONTEXT_MESSAGES = 5  # Recent messages included in each chat prompt
 
 # List of popular/reputable domains that likely have good UX
 # This list can be expanded as needed
-REPUTABLE_DOMAINS = [
+REPUTABLE_DOMAINS = frozenset([
     'google', 'amazon', 'apple', 'microsoft', 'facebook', 'meta', 'twitter', 
     'linkedin', 'github', 'stackoverflow', 'netflix', 'spotify', 'airbnb', 
     'uber', 'shopify', 'stripe', 'slack', 'notion', 'zoom', 'dropbox', 
     'mailchimp', 'hubspot', 'salesforce', 'adobe', 'squarespace', 'wix',
     'wordpress', 'webflow', 'atlassian', 'canva', 'figma', 'asana', 'trello'
-]
+])
+
+# Substring terms used while scanning the DOM for conversion elements
+CTA_CLASS_TERMS = ('cta', 'btn')
+CTA_TEXT_TERMS = ('sign up', 'get started', 'try now', 'buy now', 'subscribe', 'download', 'join', 'start')
+TESTIMONIAL_CLASS_TERMS = ('testimonial', 'review')
+SOCIAL_PROOF_TERMS = ('testimonial', 'review', 'stars', 'rating', 'trust', 'customer story')
+CTA_TAGS = frozenset(['button', 'a'])
+NAV_TAGS = frozenset(['nav', 'header', 'menu'])
+
+def compile_terms(terms, flags=0):
+    """Compile substring terms into one alternation regex so a single scan tests them all."""
+    return re.compile('|'.join(map(re.escape, terms)), flags)
+
+CTA_CLASS_RE = compile_terms(CTA_CLASS_TERMS)
+CTA_TEXT_RE = compile_terms(CTA_TEXT_TERMS, re.I)
+TESTIMONIAL_CLASS_RE = compile_terms(TESTIMONIAL_CLASS_TERMS)
+SOCIAL_PROOF_RE = compile_terms(SOCIAL_PROOF_TERMS)
+
+# Chat topic detection: messages matching an off-topic term and no CRO term get redirected
+OFF_TOPIC_TERMS = ("personal", "politics", "medical advice", "legal advice", "investments",
+                   "dating", "games", "movies", "music", "sports", "weather", "news")
+CRO_TERMS = ("website", "conversion", "ux", "ui", "page", "user", "customer", "traffic", "bounce", "cro", "optimization")
+OFF_TOPIC_RE = compile_terms(OFF_TOPIC_TERMS, re.I)
+CRO_RE = compile_terms(CRO_TERMS, re.I)
+
+# Canned chat replies that skip the model entirely
+GREETINGS = frozenset(['hi', 'hello', 'hey', 'greetings'])
+
+GREETING_REPLY = """Hello! I'm your CRO Assistant, here to help optimize your website's conversion rate. 
+
+How can I help you today? I can assist with website analysis, conversion optimization strategies, UX improvements, or answer questions about boosting your conversion rates."""
+
+OFF_TOPIC_REPLY = """I'm sorry, I'm specialized in website conversion rate optimization and can only help with questions related to improving websites, user experience, or digital marketing strategies. 
+
+Could you ask me something about optimizing your website, improving user experience, or increasing conversion rates?"""
+
+# Precompiled patterns for pulling JSON out of Gemini responses
+JSON_FENCE_RE = re.compile(r'```(?:json)?\s*([\s\S]*?)\s*```')
+JSON_OBJECT_RE = re.compile(r'(\{[\s\S]*\})')
+
+# Numeric dimension with an optional unit, e.g. "1200", "1200px", "90%", "12em"
+DIMENSION_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(px|em|rem|vw|vh|%)?\s*$', re.I)
+# Size limits for relative units (80% of the container, 10em, half the viewport)
+UNIT_THRESHOLDS = {'%': 80, 'em': 10, 'rem': 10, 'vw': 50, 'vh': 50}
 
 # Add the GeminiRateLimiter class and rate_limited_gemini_call decorator
 import time
@@ -53,43 +228,52 @@ from functools import wraps
 class GeminiRateLimiter:
     def __init__(self, max_requests=60, per_minute=1):
         """
-        Initialize rate limiter for Gemini API
-        :param max_requests: Maximum number of requests allowed
+        Initialize token-bucket rate limiter for Gemini API
+        :param max_requests: Maximum number of requests allowed (bucket capacity)
         :param per_minute: Time window in minutes
         """
         self.max_requests = max_requests
         self.per_minute = per_minute
-        self.request_timestamps = []
+        self.capacity = max_requests
+        self.refill_rate = max_requests / (per_minute * 60)  # Tokens per second
+        self.tokens = float(self.capacity)
+        # Monotonic clock so wall-clock adjustments don't skew the bucket
+        self.last_refill = time.monotonic()
         self.last_retry_time = 0
         self.retry_delay = 0
+        # Shared by every Flask request thread, so guard all state updates
+        self._cv = threading.Condition()
 
     def wait_if_needed(self):
         """
         Wait if rate limit is exceeded or retry delay is in effect
         """
-        current_time = time.time()
-        
-        # Check if we need to wait due to previous API error
-        if current_time < self.last_retry_time + self.retry_delay:
-            wait_time = (self.last_retry_time + self.retry_delay) - current_time
-            print(f"⏳ Waiting for {wait_time:.2f} seconds due to previous rate limit error")
-            time.sleep(wait_time)
-        
-        # Clean up old request timestamps
-        self.request_timestamps = [
-            ts for ts in self.request_timestamps 
-            if current_time - ts < (self.per_minute * 60)
-        ]
-        
-        # If we've reached max requests, wait
-        if len(self.request_timestamps) >= self.max_requests:
-            oldest_request = self.request_timestamps[0]
-            wait_time = (self.per_minute * 60) - (current_time - oldest_request)
-            print(f"⏳ Rate limit reached. Waiting for {wait_time:.2f} seconds")
-            time.sleep(wait_time)
-        
-        # Record this request
-        self.request_timestamps.append(current_time)
+        # Waiters block on the condition and recompute whenever they are woken,
+        # so they are released as soon as a token is available
+        with self._cv:
+            while True:
+                current_time = time.monotonic()
+                
+                # Refill tokens for the time elapsed since the last call
+                self.tokens = min(self.capacity, self.tokens + (current_time - self.last_refill) * self.refill_rate)
+                self.last_refill = current_time
+                
+                # Check if we need to wait due to previous API error
+                retry_wait = (self.last_retry_time + self.retry_delay) - current_time
+                if retry_wait > 0:
+                    logger.warning(f"⏳ Waiting for {retry_wait:.2f} seconds due to previous rate limit error")
+                    self._cv.wait(timeout=retry_wait)
+                    continue
+                
+                # Consume a token for this request
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                # Otherwise wait until one token has accumulated
+                wait_time = (1 - self.tokens) / self.refill_rate
+                logger.warning(f"⏳ Rate limit reached. Waiting for {wait_time:.2f} seconds")
+                self._cv.wait(timeout=wait_time)
 
     def handle_rate_limit_error(self, error):
         """
@@ -99,21 +283,28 @@ class GeminiRateLimiter:
         # Extract retry delay if available
         try:
             retry_delay = error.retry_delay.seconds if hasattr(error, 'retry_delay') else 30
-            self.retry_delay = retry_delay
-            self.last_retry_time = time.time()
-            print(f"🚫 Rate limit error. Retry after {retry_delay} seconds")
         except:
             # Default fallback
-            self.retry_delay = 30
-            self.last_retry_time = time.time()
-            print("🚫 Rate limit error. Using default retry delay")
+            retry_delay = 30
+            logger.warning("🚫 Rate limit error. Using default retry delay")
+        else:
+            logger.warning(f"🚫 Rate limit error. Retry after {retry_delay} seconds")
+        
+        with self._cv:
+            self.retry_delay = retry_delay
+            self.last_retry_time = time.monotonic()
+            # Wake waiters so they recompute against the new retry delay
+            self._cv.notify_all()
+
+# Single limiter instance shared by every rate-limited Gemini call
+gemini_rate_limiter = GeminiRateLimiter()
 
 def rate_limited_gemini_call(func):
     """
     Decorator to add rate limiting to Gemini API calls
     """
     # Shared rate limiter across all calls
-    rate_limiter = GeminiRateLimiter()
+    rate_limiter = gemini_rate_limiter
     
     @wraps(func)
     def wrapper(*args, **kwargs):
@@ -139,42 +330,103 @@ def rate_limited_gemini_call(func):
     
     return wrapper
 
-# Configure the Gemini API with rate limiting
+# System prompt for the CRO-specific chatbot
+CHAT_SYSTEM_PROMPT = """You are a Conversion Rate Optimization (CRO) specialist chatbot. Your job is to help users understand and improve their website's conversion rates.
+
+Guidelines:
+1. Be friendly, helpful, and professional.
+2. Only discuss topics related to websites, UX, UI, conversion optimization, and digital marketing.
+3. If the user asks about something unrelated to these topics, politely explain that you can only help with website and CRO-related questions.
+4. If the user says hello or greets you, respond warmly and ask how you can help them with their website or conversion challenges.
+5. Suggest specific actionable advice when possible.
+6. Keep responses concise but informative.
+7. When appropriate, suggest they use the site analyzer tool for comprehensive insights.
+
+Common CRO topics you can discuss:
+- Call-to-Action optimization
+- Form design and conversion
+- Page load speed issues
+- Mobile responsiveness
+- User experience (UX) best practices
+- A/B testing strategies
+- Landing page optimization
+- Checkout optimization
+- Social proof implementation
+- Website copy and messaging"""
+
+# Configure the Gemini API once at import; the client config is process-global and the
+# model object is reused by every request
+genai.configure(api_key=GEMINI_API_KEY)
+GEMINI_MODEL_NAME = 'gemini-1.5-pro'
+CHAT_MODEL_NAME = 'gemini-1.5-flash'  # Faster per output token; chat replies are short
+
+# Analysis needs room for the full structured JSON report
+ANALYSIS_GENERATION_CONFIG = {
+    "temperature": 0.1,  # Reduced from 0.2 for more consistent outputs
+    "top_p": 0.8,
+    "top_k": 40,
+    "max_output_tokens": 2048,
+}
+
+# Chat replies are meant to be concise, so cap their length
+CHAT_GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "top_p": 0.9,
+    "max_output_tokens": 300,
+}
+
+# Use the latest Gemini model with configuration for better structured output
+gemini_model = genai.GenerativeModel(GEMINI_MODEL_NAME, generation_config=ANALYSIS_GENERATION_CONFIG)
+
+# Chat model with the CRO system prompt as its system instruction, so it isn't rebuilt into every prompt
+chat_model = genai.GenerativeModel(CHAT_MODEL_NAME,
+                                   generation_config=CHAT_GENERATION_CONFIG,
+                                   system_instruction=CHAT_SYSTEM_PROMPT)
+
+# Set once the connection warm-up has been started; it is attempted only once per process
+gemini_warmup_started = threading.Event()
+
+def warm_gemini_connection():
+    """Open the Gemini client connection with a free count_tokens call (no generation, no rate-limit token)."""
+    try:
+        gemini_model.count_tokens("ping")
+    except Exception as e:
+        logger.warning(f"⚠️ Gemini connection warm-up failed: {str(e)}")
+
+# Generate a chat reply with rate limiting
+@rate_limited_gemini_call
+def generate_chat_reply(model, prompt):
+    """Send a chat prompt to Gemini and return the response text."""
+    return model.generate_content(prompt).text
+
+# Start a streamed chat reply with rate limiting
 @rate_limited_gemini_call
-def configure_gemini():
-    genai.configure(api_key=GEMINI_API_KEY)
-    # Use the latest Gemini model with configuration for better structured output
-    model = genai.GenerativeModel('gemini-1.5-pro', 
-                                 generation_config={
-                                     "temperature": 0.1,  # Reduced from 0.2 for more consistent outputs
-                                     "top_p": 0.8,
-                                     "top_k": 40,
-                                     "max_output_tokens": 2048,
-                                 })
-    return model
+def stream_chat_reply(model, prompt):
+    """Send a chat prompt to Gemini and return an iterator over the response text chunks."""
+    response = model.generate_content(prompt, stream=True)
+    return (chunk.text for chunk in response)
 
 # Add caching decorator for expensive operations
-def cached_function(expiry_seconds=300):
+def cached_function(expiry_seconds=300, maxsize=512):
     """Cache decorator for expensive functions."""
-    cache = {}
-    lock = threading.Lock()
+    cache = TTLCache(maxsize=maxsize, ttl=expiry_seconds)
+    lock = threading.RLock()
     
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            key = str(args) + str(kwargs)
+            key = hashkey(*args, **kwargs)
             with lock:
-                # Check if we have a cached result that hasn't expired
-                if key in cache:
-                    result, timestamp = cache[key]
-                    if time.time() - timestamp < expiry_seconds:
-                        print(f"🔄 Cache hit for {func.__name__}")
-                        return result
+                # Expired entries are dropped by the TTLCache itself
+                result = cache.get(key)
+            if result is not None:
+                logger.debug(f"🔄 Cache hit for {func.__name__}")
+                return result
             
             # Run the function and cache the result
             result = func(*args, **kwargs)
             with lock:
-                cache[key] = (result, time.time())
+                cache[key] = result
             return result
         return wrapper
     return decorator
@@ -185,146 +437,197 @@ def is_large_dimension(value, threshold=1200):  # Increased threshold from 1000
     if not value:
         return False
     
-    try:
-        # If it's a pure number or numeric string
-        if str(value).isdigit():
-            return int(value) > threshold
-        # If it contains '%', it's relative to container
-        elif '%' in str(value):
-            # Consider percentage dimensions over 80% as potentially large
-            percentage = float(str(value).replace('%', ''))
-            return percentage > 80
-        # Remove 'px' if present and try to convert
-        elif 'px' in str(value).lower():
-            numeric_part = str(value).lower().replace('px', '')
-            return numeric_part.isdigit() and int(numeric_part) > threshold
-        # Handle 'em', 'rem', 'vw', 'vh' values
-        elif any(unit in str(value).lower() for unit in ['em', 'rem', 'vw', 'vh']):
-            # Extract numeric part
-            numeric_part = ''.join([c for c in str(value) if c.isdigit() or c == '.'])
-            try:
-                numeric_value = float(numeric_part)
-                # For relative units, use a lower threshold
-                if 'em' in str(value) or 'rem' in str(value):
-                    return numeric_value > 10  # 10em is quite large
-                elif 'vw' in str(value) or 'vh' in str(value):
-                    return numeric_value > 50  # 50vw/vh is half the viewport
-            except:
-                return False
-        return False
-    except:
+    match = DIMENSION_RE.match(str(value))
+    if not match:
         return False
+    
+    # Pixel and unitless values use the threshold; relative units have their own limits
+    unit = (match.group(2) or '').lower()
+    return float(match.group(1)) > UNIT_THRESHOLDS.get(unit, threshold)
+
+# Memoize domain extraction since the same hosts are analyzed repeatedly
+@functools.lru_cache(maxsize=1024)
+def extract_domain(url):
+    """Return the lowercased registered domain name (without suffix) for a URL."""
+    # Use tldextract to handle subdomains properly
+    return tldextract.extract(url).domain.lower()
 
 # Check if a website belongs to a reputable domain (new function)
 def is_reputable_domain(url):
     """Check if the URL belongs to a reputable domain that likely has good UX practices."""
     try:
-        # Extract the domain using tldextract to handle subdomains properly
-        extract_result = tldextract.extract(url)
-        domain = extract_result.domain.lower()
-        
-        # Check if the domain name is in our list of reputable domains
-        return domain in REPUTABLE_DOMAINS
+        # Check if the domain name is in our set of reputable domains
+        return extract_domain(url) in REPUTABLE_DOMAINS
     except:
         return False
 
-# Extract website content with improved error handling
-@cached_function(expiry_seconds=600)
-def extract_website_content(url):
-    """Extract and analyze website content with caching and better error handling."""
-    try:
-        if url in website_content_cache:
-            print(f"🔄 Website content cache hit for {url}")
-            return website_content_cache[url], True
-            
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        print(f"🌐 Fetching website content for: {url}")
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Basic website data
-        title = soup.title.string if soup.title else "No title found"
-        
-        # Extract text content
-        text_content = soup.get_text(separator=' ', strip=True)
-        
-        # Extract meta descriptions
-        meta_description = ""
-        meta_tag = soup.find('meta', attrs={'name': 'description'})
-        if meta_tag and 'content' in meta_tag.attrs:
-            meta_description = meta_tag['content']
-        
-        # Extract keywords (new)
-        keywords = ""
-        keywords_tag = soup.find('meta', attrs={'name': 'keywords'})
-        if keywords_tag and 'content' in keywords_tag.attrs:
-            keywords = keywords_tag['content']
-        
-        # Extract CTAs, forms, and navigation elements
-        ctas = soup.find_all(['button', 'a'], class_=lambda x: x and ('cta' in str(x).lower() or 'btn' in str(x).lower()))
-        
-        # Additional CTA detection by text content
-        additional_ctas = soup.find_all(['button', 'a'], text=lambda x: x and ('sign up' in str(x).lower() or 
-                                                                              'get started' in str(x).lower() or 
-                                                                              'try now' in str(x).lower() or 
-                                                                              'buy now' in str(x).lower() or
-                                                                              'subscribe' in str(x).lower() or
-                                                                              'download' in str(x).lower() or
-                                                                              'join' in str(x).lower() or
-                                                                              'start' in str(x).lower()))
-        
-        # Combine the CTA lists, removing duplicates
-        all_ctas = list(set(ctas + additional_ctas))
+# Collect all DOM-based metrics in a single traversal of the parsed page
+def collect_page_metrics(soup):
+    """Walk the DOM once and count CTAs, forms, social proof, scripts, images and other signals."""
+    metrics = {
+        'title': None,
+        'meta_description': "",
+        'keywords': "",
+        'ctas_count': 0,
+        'forms_count': 0,
+        'nav_elements_count': 0,
+        'testimonials_count': 0,
+        'footer_elements_count': 0,
+        'scripts_count': 0,
+        'async_scripts_count': 0,
+        'defer_scripts_count': 0,
+        'images_count': 0,
+        'lazy_loaded_images_count': 0,
+        'large_images_count': 0,
+        'has_responsive_meta': False,
+        'responsive_meta_content': "",
+        'media_queries_count': 0,
+        'has_manifest': False,
+        'has_service_worker': False,
+        'aria_attributes_count': 0,
+    }
+    
+    for tag in soup.descendants:
+        if not isinstance(tag, Tag):
+            continue
         
-        forms = soup.find_all('form')
-        nav_elements = soup.find_all(['nav', 'header', 'menu'])
+        name = tag.name
+        attrs = tag.attrs
         
-        # Extract social proof elements
-        testimonials = soup.find_all(class_=lambda x: x and ('testimonial' in str(x).lower() or 'review' in str(x).lower()))
+        # Lowercase the class and id attributes once per element
+        classes = attrs.get('class')
+        class_lower = (' '.join(classes) if isinstance(classes, list) else str(classes or '')).lower()
+        attrs_lower = f"{class_lower} {str(attrs.get('id', '')).lower()}"
         
-        # Count social proof elements by looking for testimonial-like content
-        social_proof_elements = soup.find_all(lambda tag: any(term in str(tag).lower() for term in 
-                                                            ['testimonial', 'review', 'stars', 'rating', 'trust', 'customer story']))
+        # Accessibility attributes
+        for attr_name in attrs:
+            if attr_name.startswith('aria-'):
+                metrics['aria_attributes_count'] += 1
         
-        # Detect footer elements
-        footer_elements = soup.find_all(['footer']) + soup.find_all(class_=lambda x: x and 'footer' in str(x).lower())
+        # CTAs detected by class name or by button/link text (each element counted once)
+        if name in CTA_TAGS:
+            if CTA_CLASS_RE.search(class_lower):
+                metrics['ctas_count'] += 1
+            else:
+                text = tag.string
+                if text and CTA_TEXT_RE.search(text):
+                    metrics['ctas_count'] += 1
         
-        # Analyze load speed indicators (script and image count)
-        scripts = soup.find_all('script')
+        if name == 'form':
+            metrics['forms_count'] += 1
+        elif name in NAV_TAGS:
+            metrics['nav_elements_count'] += 1
+        elif name == 'footer':
+            metrics['footer_elements_count'] += 1
+        elif name == 'title' and metrics['title'] is None:
+            metrics['title'] = tag.string
+        elif name == 'script':
+            metrics['scripts_count'] += 1
+            if 'async' in attrs:
+                metrics['async_scripts_count'] += 1
+            if 'defer' in attrs:
+                metrics['defer_scripts_count'] += 1
+            script_text = tag.string
+            if not metrics['has_service_worker'] and script_text and 'serviceWorker' in script_text:
+                metrics['has_service_worker'] = True
+        elif name == 'img':
+            metrics['images_count'] += 1
+            if attrs.get('loading') == 'lazy':
+                metrics['lazy_loaded_images_count'] += 1
+            # Use the improved is_large_dimension function to check image sizes
+            if is_large_dimension(attrs.get('width')) or is_large_dimension(attrs.get('height')):
+                metrics['large_images_count'] += 1
+        elif name == 'style':
+            style_text = tag.string
+            if style_text:
+                metrics['media_queries_count'] += style_text.count('@media')
+        elif name == 'link':
+            if 'manifest' in (attrs.get('rel') or []):
+                metrics['has_manifest'] = True
+        elif name == 'meta':
+            meta_name = attrs.get('name')
+            if meta_name == 'description' and not metrics['meta_description'] and 'content' in attrs:
+                metrics['meta_description'] = attrs['content']
+            elif meta_name == 'keywords' and not metrics['keywords'] and 'content' in attrs:
+                metrics['keywords'] = attrs['content']
+            elif meta_name == 'viewport' and not metrics['has_responsive_meta']:
+                metrics['has_responsive_meta'] = True
+                metrics['responsive_meta_content'] = attrs.get('content', '')
         
-        # Check for script optimizations (new)
-        async_scripts = soup.find_all('script', attrs={'async': True})
-        defer_scripts = soup.find_all('script', attrs={'defer': True})
+        # Footer-like elements by class name
+        if 'footer' in class_lower:
+            metrics['footer_elements_count'] += 1
         
-        images = soup.find_all('img')
+        # Social proof: testimonial classes plus trust-related class/id names
+        if TESTIMONIAL_CLASS_RE.search(class_lower):
+            metrics['testimonials_count'] += 1
+        if SOCIAL_PROOF_RE.search(attrs_lower):
+            metrics['testimonials_count'] += 1
+    
+    if metrics['title'] is None:
+        metrics['title'] = "No title found"
+    
+    return metrics
+
+# Download a page body without reading more than MAX_CONTENT_BYTES
+def fetch_page_content(url, headers):
+    """Stream the page body and stop once the size cap is reached."""
+    with http_session.get(url, headers=headers, timeout=15, stream=True) as response:
+        response.raise_for_status()
         
-        # Check for lazy-loaded images (new)
-        lazy_loaded_images = soup.find_all('img', attrs={'loading': 'lazy'})
+        # Reject pages that announce a body larger than we are willing to read
+        content_length = response.headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > MAX_CONTENT_BYTES:
+            raise ValueError(f"Page is too large to analyze ({content_length} bytes)")
         
-        # Use the improved is_large_dimension function to check image sizes
-        large_images = [img for img in images if 
-                       (img.get('width') and is_large_dimension(img.get('width'))) or 
-                       (img.get('height') and is_large_dimension(img.get('height')))]
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=65536):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= MAX_CONTENT_BYTES:
+                logger.info(f"✂️ Truncating page content at {MAX_CONTENT_BYTES} bytes for {url}")
+                break
+    
+    return b''.join(chunks)[:MAX_CONTENT_BYTES]
+
+# Extract visible page text without materializing more than we need
+def extract_text_content(soup, limit=MAX_TEXT_CHARS):
+    """Join the page's stripped strings with spaces, stopping once `limit` characters are collected."""
+    parts = []
+    size = 0
+    for text in soup.stripped_strings:
+        parts.append(text)
+        size += len(text) + 1  # Account for the joining space
+        if size >= limit:
+            break
+    return ' '.join(parts)[:limit]
+
+# Extract website content with improved error handling
+@cached_function(expiry_seconds=600)
+def extract_website_content(url):
+    """Extract and analyze website content with caching and better error handling."""
+    try:
+        with website_content_lock:
+            cached_data = website_content_cache.get(url)
+        if cached_data is not None:
+            logger.debug(f"🔄 Website content cache hit for {url}")
+            return cached_data, True
+            
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
         
-        # Analyze mobile responsiveness signals
-        has_viewport_meta = bool(soup.find('meta', attrs={'name': 'viewport'}))
-        responsive_meta = soup.find('meta', attrs={'name': 'viewport'})
-        responsive_meta_content = responsive_meta.get('content', '') if responsive_meta else ''
+        logger.info(f"🌐 Fetching website content for: {url}")
+        content = fetch_page_content(url, headers)
         
-        # Count responsive design elements
-        media_queries_count = len(re.findall(r'@media', str(soup.find_all('style'))))
+        soup = BeautifulSoup(content, HTML_PARSER)
         
-        # Check for presence of PWA features (new)
-        has_manifest = bool(soup.find('link', attrs={'rel': 'manifest'}))
-        has_service_worker = bool(re.search(r'serviceWorker', str(soup.find_all('script'))))
+        # Extract text content, capped at MAX_TEXT_CHARS
+        text_content = extract_text_content(soup)
         
-        # Check for accessibility features (new)
-        aria_attributes = len(re.findall(r'aria-[a-z]+', str(soup)))
+        # Count CTAs, forms, social proof, performance and responsiveness signals in one pass
+        metrics = collect_page_metrics(soup)
         
         # Check if domain is reputable
         is_reputable = is_reputable_domain(url)
@@ -332,38 +635,39 @@ def extract_website_content(url):
         # Organize data with additional metrics
         website_data = {
             'url': url,
-            'title': title,
-            'meta_description': meta_description,
-            'keywords': keywords,  # New field
-            'text_content': text_content[:20000],  # Increased from 10000 to 20000 for better analysis
-            'ctas_count': len(all_ctas),
-            'forms_count': len(forms),
-            'nav_elements_count': len(nav_elements),
-            'testimonials_count': len(testimonials) + len(social_proof_elements),
-            'footer_elements_count': len(footer_elements),
-            'scripts_count': len(scripts),
-            'async_scripts_count': len(async_scripts),  # New field
-            'defer_scripts_count': len(defer_scripts),  # New field
-            'images_count': len(images),
-            'lazy_loaded_images_count': len(lazy_loaded_images),  # New field
-            'large_images_count': len(large_images),
-            'has_responsive_meta': has_viewport_meta,
-            'responsive_meta_content': responsive_meta_content,
-            'media_queries_count': media_queries_count,
-            'has_manifest': has_manifest,  # New field
-            'has_service_worker': has_service_worker,  # New field
-            'aria_attributes_count': aria_attributes,  # New field
-            'is_reputable_domain': is_reputable  # New field to influence scoring
+            'title': metrics['title'],
+            'meta_description': metrics['meta_description'],
+            'keywords': metrics['keywords'],
+            'text_content': text_content,
+            'ctas_count': metrics['ctas_count'],
+            'forms_count': metrics['forms_count'],
+            'nav_elements_count': metrics['nav_elements_count'],
+            'testimonials_count': metrics['testimonials_count'],
+            'footer_elements_count': metrics['footer_elements_count'],
+            'scripts_count': metrics['scripts_count'],
+            'async_scripts_count': metrics['async_scripts_count'],
+            'defer_scripts_count': metrics['defer_scripts_count'],
+            'images_count': metrics['images_count'],
+            'lazy_loaded_images_count': metrics['lazy_loaded_images_count'],
+            'large_images_count': metrics['large_images_count'],
+            'has_responsive_meta': metrics['has_responsive_meta'],
+            'responsive_meta_content': metrics['responsive_meta_content'],
+            'media_queries_count': metrics['media_queries_count'],
+            'has_manifest': metrics['has_manifest'],
+            'has_service_worker': metrics['has_service_worker'],
+            'aria_attributes_count': metrics['aria_attributes_count'],
+            'is_reputable_domain': is_reputable  # Used to influence scoring
         }
         
         # Store in cache
-        website_content_cache[url] = website_data
+        with website_content_lock:
+            website_content_cache[url] = website_data
         
-        print(f"✅ Successfully extracted website data for {url}")
+        logger.info(f"✅ Successfully extracted website data for {url}")
         return website_data, True
     except Exception as e:
         error_message = str(e)
-        print(f"❌ Error extracting website content: {error_message}")
+        logger.exception(f"❌ Error extracting website content: {error_message}")
         
         # Create error data with the URL
         error_data = {'error': error_message, 'url': url}
@@ -371,34 +675,40 @@ def extract_website_content(url):
 
 # Parse JSON from response with better error handling
 def parse_json_from_response(text):
-    """Extract JSON from the AI response with enhanced error handling."""
+    """Extract JSON from the AI response. Returns (data, success); on failure data is the default response."""
     if not text or not isinstance(text, str):
-        print(f"⚠️ Invalid response text: {type(text)}")
-        return create_default_response()
+        logger.warning(f"⚠️ Invalid response text: {type(text)}")
+        return create_default_response(), False
         
     try:
-        # First, try to parse the entire response as JSON
-        return json.loads(text)
-    except json.JSONDecodeError:
-        try:
-            # If that fails, try to find JSON within markdown code blocks
-            json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', text)
-            if json_match:
-                json_text = json_match.group(1).strip()
-                return json.loads(json_text)
-            
-            # If no code block, try to find anything that looks like a JSON object
-            json_match = re.search(r'(\{[\s\S]*\})', text)
-            if json_match:
-                return json.loads(json_match.group(1))
-        except Exception as e:
-            print(f"❌ JSON extraction failed: {str(e)}")
+        # Gemini usually wraps its JSON in a markdown code block, so look for that first
+        json_match = JSON_FENCE_RE.search(text)
+        if json_match:
+            try:
+                return json_loads(json_match.group(1).strip()), True
+            except json.JSONDecodeError:
+                pass
+        
+        # Otherwise the whole response may already be JSON
+        stripped_text = text.strip()
+        if stripped_text.startswith(('{', '[')):
+            try:
+                return json_loads(stripped_text), True
+            except json.JSONDecodeError:
+                pass
+        
+        # If not, try to find anything that looks like a JSON object
+        json_match = JSON_OBJECT_RE.search(text)
+        if json_match:
+            return json_loads(json_match.group(1)), True
+    except Exception as e:
+        logger.exception(f"❌ JSON extraction failed: {str(e)}")
     
-    return create_default_response()
+    return create_default_response(), False
 
 def create_default_response():
     """Create a default response structure for fallback scenarios."""
-    print(f"⚠️ Using default fallback structure.")
+    logger.warning("⚠️ Using default fallback structure.")
     return {
         "overall_score": 65,
         "health_score": {
@@ -431,14 +741,14 @@ def calculate_health_score(overall_score, is_reputable=False, optimization_indic
     if is_reputable:
         bonus = min(10, max(5, overall_score // 10))  # Larger bonus for sites with already decent scores
         adjusted_score = min(100, overall_score + bonus)
-        print(f"📈 Adjusting score for reputable domain: {overall_score} → {adjusted_score}")
+        logger.info(f"📈 Adjusting score for reputable domain: {overall_score} → {adjusted_score}")
         overall_score = adjusted_score
     
     # Apply bonus points for optimization indicators (up to +5)
     if optimization_indicators > 0:
         bonus = min(5, optimization_indicators)
         adjusted_score = min(100, overall_score + bonus)
-        print(f"📈 Adjusting score for optimization indicators: {overall_score} → {adjusted_score}")
+        logger.info(f"📈 Adjusting score for optimization indicators: {overall_score} → {adjusted_score}")
         overall_score = adjusted_score
     
     # Improved thresholds with more nuanced categories
@@ -467,6 +777,45 @@ def calculate_health_score(overall_score, is_reputable=False, optimization_indic
         "description": description
     }
 
+# Static analysis instructions appended to every website analysis prompt
+ANALYSIS_PROMPT_INSTRUCTIONS = """Analysis guidelines:
+1. Consider that established/popular websites often use sophisticated techniques
+2. Low element counts might be intentional for minimalist design
+3. High element counts aren't inherently problematic if well-organized
+4. Evaluate page based on UX best practices for its apparent purpose
+5. Consider mobile responsiveness and performance optimization features
+6. Identify issues that genuinely impact conversions, not just technical preferences
+
+Analyze this data for UX and conversion rate optimization issues. Provide your analysis as a structured JSON object with the following format:
+
+{
+  "overall_score": <A number from 0-100 representing overall UX health>,
+  "issues": [
+    {
+      "category": "<Category name: Call-to-Action, Forms, Navigation, Social Proof, Page Speed, Mobile Responsiveness, or Content>",
+      "description": "<Detailed explanation of the issue>",
+      "impact": "<High, Medium, or Low>",
+      "solution": "<Specific recommendation to fix the issue>"
+    }
+  ]
+}
+
+Identify 5 key issues across different categories that would most impact conversion rates.
+For each issue:
+1. Provide a clear problem description
+2. Explain the expected impact on conversion rates
+3. Give a specific, actionable solution recommendation
+
+Scoring guidance:
+- 90-100: Exceptional websites with minimal issues
+- 80-89: Good websites with a few minor improvements needed
+- 70-79: Decent websites with several areas for improvement
+- 60-69: Websites with significant issues affecting conversions
+- 50-59: Websites with major usability or conversion problems
+- Below 50: Only for websites with critical, pervasive issues
+
+YOU MUST RETURN A VALID JSON OBJECT. DO NOT INCLUDE ANY EXPLANATION TEXT BEFORE OR AFTER THE JSON."""
+
 # Analyze website with rate limiting
 @rate_limited_gemini_call
 def analyze_website(model, website_data, session_id):
@@ -490,82 +839,47 @@ def analyze_website(model, website_data, session_id):
     if website_data.get('aria_attributes_count', 0) > 5:
         optimization_indicators += 1
     
-    # Improved prompt with more nuanced analysis instructions
-    prompt = f"""
-    Analyze this website data for UX and conversion rate optimization (CRO) issues:
-    
-    URL: {website_data['url']}
-    Page title: {website_data['title']}
-    Meta description: {website_data['meta_description']}
-    Keywords: {website_data.get('keywords', 'Not specified')}
-    
-    Key statistics:
-    - CTAs detected: {website_data['ctas_count']}
-    - Forms detected: {website_data['forms_count']}
-    - Navigation elements: {website_data['nav_elements_count']}
-    - Testimonial/social proof elements: {website_data['testimonials_count']}
-    - Scripts count: {website_data['scripts_count']}
-    - Async scripts: {website_data.get('async_scripts_count', 0)}
-    - Defer scripts: {website_data.get('defer_scripts_count', 0)}
-    - Images count: {website_data['images_count']}
-    - Lazy-loaded images: {website_data.get('lazy_loaded_images_count', 0)}
-    - Large images count: {website_data['large_images_count']}
-    - Has responsive meta tag: {website_data['has_responsive_meta']}
-    - Media queries detected: {website_data['media_queries_count']}
-    - Has web app manifest: {website_data.get('has_manifest', False)}
-    - Has service worker: {website_data.get('has_service_worker', False)}
-    - Accessibility attributes: {website_data.get('aria_attributes_count', 0)}
-    
-    Page content sample (first part): {website_data['text_content'][:10000]}
-    
-    Page content sample (second part): {website_data['text_content'][10000:20000]}
-    
-    Analysis guidelines:
-    1. Consider that established/popular websites often use sophisticated techniques
-    2. Low element counts might be intentional for minimalist design
-    3. High element counts aren't inherently problematic if well-organized
-    4. Evaluate page based on UX best practices for its apparent purpose
-    5. Consider mobile responsiveness and performance optimization features
-    6. Identify issues that genuinely impact conversions, not just technical preferences
-    
-    Analyze this data for UX and conversion rate optimization issues. Provide your analysis as a structured JSON object with the following format:
-    
-    {{
-      "overall_score": <A number from 0-100 representing overall UX health>,
-      "issues": [
-        {{
-          "category": "<Category name: Call-to-Action, Forms, Navigation, Social Proof, Page Speed, Mobile Responsiveness, or Content>",
-          "description": "<Detailed explanation of the issue>",
-          "impact": "<High, Medium, or Low>",
-          "solution": "<Specific recommendation to fix the issue>"
-        }}
-      ]
-    }}
-    
-    Identify 5 key issues across different categories that would most impact conversion rates.
-    For each issue:
-    1. Provide a clear problem description
-    2. Explain the expected impact on conversion rates
-    3. Give a specific, actionable solution recommendation
-    
-    Scoring guidance:
-    - 90-100: Exceptional websites with minimal issues
-    - 80-89: Good websites with a few minor improvements needed
-    - 70-79: Decent websites with several areas for improvement
-    - 60-69: Websites with significant issues affecting conversions
-    - 50-59: Websites with major usability or conversion problems
-    - Below 50: Only for websites with critical, pervasive issues
-    
-    YOU MUST RETURN A VALID JSON OBJECT. DO NOT INCLUDE ANY EXPLANATION TEXT BEFORE OR AFTER THE JSON.
-    """
+    # Improved prompt with more nuanced analysis instructions; only the data lines vary per call
+    prompt_parts = [
+        "Analyze this website data for UX and conversion rate optimization (CRO) issues:",
+        "",
+        f"URL: {website_data['url']}",
+        f"Page title: {website_data['title']}",
+        f"Meta description: {website_data['meta_description']}",
+        f"Keywords: {website_data.get('keywords', 'Not specified')}",
+        "",
+        "Key statistics:",
+        f"- CTAs detected: {website_data['ctas_count']}",
+        f"- Forms detected: {website_data['forms_count']}",
+        f"- Navigation elements: {website_data['nav_elements_count']}",
+        f"- Testimonial/social proof elements: {website_data['testimonials_count']}",
+        f"- Scripts count: {website_data['scripts_count']}",
+        f"- Async scripts: {website_data.get('async_scripts_count', 0)}",
+        f"- Defer scripts: {website_data.get('defer_scripts_count', 0)}",
+        f"- Images count: {website_data['images_count']}",
+        f"- Lazy-loaded images: {website_data.get('lazy_loaded_images_count', 0)}",
+        f"- Large images count: {website_data['large_images_count']}",
+        f"- Has responsive meta tag: {website_data['has_responsive_meta']}",
+        f"- Media queries detected: {website_data['media_queries_count']}",
+        f"- Has web app manifest: {website_data.get('has_manifest', False)}",
+        f"- Has service worker: {website_data.get('has_service_worker', False)}",
+        f"- Accessibility attributes: {website_data.get('aria_attributes_count', 0)}",
+        "",
+        f"Page content sample: {website_data['text_content']}",
+        "",
+        ANALYSIS_PROMPT_INSTRUCTIONS,
+    ]
+    prompt = "\n".join(prompt_parts)
     
     try:
-        print(f"🔄 Analyzing website data with Gemini: {website_data['url']}")
+        logger.info(f"🔄 Analyzing website data with Gemini: {website_data['url']}")
         response = model.generate_content(prompt)
         response_text = response.text
         
-        # Parse the JSON response
-        analysis_data = parse_json_from_response(response_text)
+        # Parse the JSON response; an unparseable reply is a failure, so it is never cached
+        analysis_data, parsed = parse_json_from_response(response_text)
+        if not parsed:
+            return analysis_data, False
         
         # Add health score data with optimization and reputation adjustments
         if "overall_score" in analysis_data:
@@ -576,18 +890,58 @@ def analyze_website(model, website_data, session_id):
             )
         
         # Store in session data
-        session_data[session_id]['analysis'] = analysis_data
+        get_session_data(session_id)['analysis'] = analysis_data
         
-        print(f"✅ Successfully analyzed website: {website_data['url']}")
+        logger.info(f"✅ Successfully analyzed website: {website_data['url']}")
         return analysis_data, True
     except Exception as e:
         error_message = str(e)
-        print(f"❌ Error analyzing website with Gemini: {error_message}")
+        logger.exception(f"❌ Error analyzing website with Gemini: {error_message}")
         
         # Return a default error response
         error_data = create_default_response()
         return error_data, False
 
+# Validate submitted URLs; memoized since the same URLs are submitted repeatedly
+@functools.lru_cache(maxsize=1024)
+def is_valid_http_url(url):
+    """Check that a URL string is an absolute http(s) URL with a host."""
+    result = urlparse(url)
+    return bool(result.netloc) and result.scheme in ('http', 'https')
+
+def is_valid_url(url):
+    """Check a submitted URL value; non-strings (e.g. JSON lists) are rejected before the cache lookup."""
+    if not isinstance(url, str):
+        return False
+    try:
+        return is_valid_http_url(url)
+    except ValueError:
+        # urlparse raises on malformed hosts such as "http://["
+        return False
+
+# Normalize URLs so trivially different links share one cached analysis
+def normalize_url(url):
+    """Lowercase scheme and host, drop the fragment and utm_* tracking parameters."""
+    parts = urlsplit(url.strip())
+    query = urlencode([(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                       if not key.lower().startswith('utm_')])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+
+def analysis_cache_key(url):
+    """Build the analysis cache key; including the model name invalidates entries on model changes."""
+    return (GEMINI_MODEL_NAME, normalize_url(url))
+
+def get_cached_analysis(cache_key):
+    """Return a copy of a cached analysis, or None on a miss."""
+    with analysis_cache_lock:
+        analysis_data = analysis_cache.get(cache_key)
+    return copy.deepcopy(analysis_data) if analysis_data is not None else None
+
+def store_cached_analysis(cache_key, analysis_data):
+    """Cache a copy of a successful analysis so later edits by the caller don't leak into it."""
+    with analysis_cache_lock:
+        analysis_cache[cache_key] = copy.deepcopy(analysis_data)
+
 # Format the response for the client
 def format_response(url, analysis_data):
     """Format the analysis data into a readable text response."""
@@ -624,7 +978,7 @@ KEY ISSUES AND RECOMMENDATIONS:
         
         return response_text
     except Exception as e:
-        print(f"❌ Error formatting response: {str(e)}")
+        logger.exception(f"❌ Error formatting response: {str(e)}")
         return f"""WEBSITE ANALYSIS REPORT
 URL: {url}
 
@@ -638,385 +992,379 @@ def get_session_id():
         return str(uuid.uuid4())
     return request.cookies.get('session_id')
 
-# Cleanup old session data periodically
-def cleanup_old_sessions():
-    """Delete session data older than 1 hour."""
-    try:
-        with lock:
-            now = time.time()
-            sessions_to_remove = []
-            for s_id, data in session_data.items():
-                if 'timestamp' not in data:
-                    data['timestamp'] = now  # Add timestamp for new sessions
-                elif data['timestamp'] < now - 3600:
-                    sessions_to_remove.append(s_id)
-            
-            for s_id in sessions_to_remove:
-                del session_data[s_id]
-                print(f"🧹 Cleaned up old session: {s_id}")
-    except Exception as e:
-        print(f"❌ Error during session cleanup: {str(e)}")
+# Endpoints that never touch session state (the homepage is publicly cacheable)
+SESSIONLESS_ENDPOINTS = frozenset(['home', 'serve'])
+
+@app.before_request
+def assign_session_id():
+    """Resolve the session ID once per request."""
+    g.session_id = get_session_id()
+
+@app.after_request
+def set_session_cookie(response):
+    """Send the session cookie only when the client doesn't already have it."""
+    session_id = g.get('session_id')
+    if (session_id and request.endpoint not in SESSIONLESS_ENDPOINTS
+            and request.cookies.get('session_id') != session_id):
+        response.set_cookie('session_id', session_id, httponly=True, samesite='Lax')
+    return response
+
+# Helper function to get or create the data dict for a session
+def get_session_data(session_id):
+    """Return the session's data dict, creating it if missing or expired."""
+    # Each session carries its own lock so updates to one session never block another
+    return session_data.get_or_create(session_id, lambda: {'lock': threading.RLock()})
+
+def get_session_lock(session_id):
+    """Return the per-session RLock used to serialize updates within a single session."""
+    return get_session_data(session_id)['lock']
+
+# Helper functions for per-session chat history
+def new_chat_history():
+    """Create an empty chat history: raw messages plus the pre-formatted lines used in prompts."""
+    return {
+        'messages': deque(maxlen=MAX_CHAT_HISTORY_MESSAGES),
+        'recent_lines': deque(maxlen=CHAT_CONTEXT_MESSAGES),
+    }
+
+def append_chat_message(history, role, content):
+    """Record a message (the bounded deque drops the oldest) and format its prompt line once."""
+    history['messages'].append({"role": role, "content": content})
+    history['recent_lines'].append(f"{'User' if role == 'user' else 'Assistant'}: {content}")
+
+def is_greeting(message):
+    """Check whether a chat message opens with a greeting word."""
+    words = message.lower().split(maxsplit=1)
+    return bool(words) and words[0].strip(string.punctuation) in GREETINGS
 
-# Dictionary to store conversation history
-chat_histories = {}
+# Helper functions for streaming chat replies as server-sent events
+def wants_event_stream():
+    """Check whether the client asked for a streamed (SSE) chat reply."""
+    return request.args.get('stream') == '1' or 'text/event-stream' in request.headers.get('Accept', '')
+
+def sse_event(payload):
+    """Format a JSON payload as a server-sent event."""
+    return f"data: {app.json.dumps(payload)}\n\n"
+
+def stream_chat_response(chunks, history, session_lock):
+    """Stream reply text chunks to the client and record the full reply in the chat history."""
+    def generate():
+        parts = []
+        try:
+            for text in chunks:
+                parts.append(text)
+                yield sse_event({"delta": text})
+            yield sse_event({"done": True})
+        except Exception as e:
+            logger.exception(f"❌ Error streaming chat response: {str(e)}")
+            yield sse_event({"error": "Failed to process your question."})
+        finally:
+            # Keep whatever was generated, even if the client disconnected early; a reply that
+            # failed before any text leaves no history entry, as on the non-streaming path
+            reply = "".join(parts)
+            if reply:
+                with session_lock:
+                    append_chat_message(history, "assistant", reply)
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 # Enhanced endpoint for chat interactions
 @app.route('/api/chat', methods=['POST'])
 def chat_interaction():
     """Handle chat interactions for CRO-specific conversations"""
-    # Get or create session ID
-    session_id = get_session_id()
+    session_id = g.session_id
     
     # Get request data
-    data = request.get_json(silent=True)
+    data = json_body()
     
-    if not data:
-        response = make_response(jsonify({"error": "Invalid request format. Expected JSON body."}), 400)
-        response.set_cookie('session_id', session_id)
-        return response
+    if not isinstance(data, dict) or not data:
+        return ojsonify({"error": "Invalid request format. Expected JSON body."}, 400)
     
     # Get user message
     user_message = data.get('message')
     if not user_message:
-        response = make_response(jsonify({"error": "No message provided"}), 400)
-        response.set_cookie('session_id', session_id)
-        return response
+        return ojsonify({"error": "No message provided"}, 400)
     
     # Initialize chat history for this session if it doesn't exist
-    if session_id not in chat_histories:
-        chat_histories[session_id] = []
+    history = chat_histories.get_or_create(session_id, new_chat_history)
     
-    # Add user message to history
-    chat_histories[session_id].append({"role": "user", "content": user_message})
+    # Add user message to history, keeping only the most recent turns
+    session_lock = get_session_lock(session_id)
+    with session_lock:
+        append_chat_message(history, "user", user_message)
+        is_new_conversation = len(history['messages']) <= 1
+        conversation_history = "\n".join(history['recent_lines'])
     
     try:
-        # Configure Gemini
-        model = configure_gemini()
-        
-        # Check if this is a new conversation
-        is_new_conversation = len(chat_histories[session_id]) <= 1
-        
-        # Create system prompt for CRO-specific chatbot
-        system_prompt = """
-        You are a Conversion Rate Optimization (CRO) specialist chatbot. Your job is to help users understand and improve their website's conversion rates.
-        
-        Guidelines:
-        1. Be friendly, helpful, and professional.
-        2. Only discuss topics related to websites, UX, UI, conversion optimization, and digital marketing.
-        3. If the user asks about something unrelated to these topics, politely explain that you can only help with website and CRO-related questions.
-        4. If the user says hello or greets you, respond warmly and ask how you can help them with their website or conversion challenges.
-        5. Suggest specific actionable advice when possible.
-        6. Keep responses concise but informative.
-        7. When appropriate, suggest they use the site analyzer tool for comprehensive insights.
-        
-        Common CRO topics you can discuss:
-        - Call-to-Action optimization
-        - Form design and conversion
-        - Page load speed issues
-        - Mobile responsiveness
-        - User experience (UX) best practices
-        - A/B testing strategies
-        - Landing page optimization
-        - Checkout optimization
-        - Social proof implementation
-        - Website copy and messaging
-        """
-        
-        # If this is the first message, handle greetings specially
-        if is_new_conversation and any(greeting in user_message.lower() for greeting in ['hi', 'hello', 'hey', 'greetings']):
-            response_text = """Hello! I'm your CRO Assistant, here to help optimize your website's conversion rate. 
-
-How can I help you today? I can assist with website analysis, conversion optimization strategies, UX improvements, or answer questions about boosting your conversion rates."""
+        # If this is the first message, answer greetings without any prompt or model work
+        if is_new_conversation and is_greeting(user_message):
+            response_text = GREETING_REPLY
+        # Redirect off-topic conversations (decided from the message alone)
+        elif OFF_TOPIC_RE.search(user_message) and not CRO_RE.search(user_message):
+            response_text = OFF_TOPIC_REPLY
         else:
-            # Build the full conversation context
-            conversation_history = "\n".join([f"{'User' if msg['role']=='user' else 'Assistant'}: {msg['content']}" 
-                                            for msg in chat_histories[session_id][-5:]])  # Just use last 5 messages
-            
-            # Create the prompt for the chatbot
-            prompt = f"""
-            {system_prompt}
+            # Use the shared chat model (system prompt is sent as its system instruction)
+            model = chat_model
             
-            Recent conversation:
-            {conversation_history}
+            # Create the prompt for the chatbot; the guidelines live in the model's system instruction
+            prompt = f"Recent conversation:\n{conversation_history}\n\nRespond to the user's most recent message."
             
-            Respond to the user's most recent message. Remember to only discuss website and CRO-related topics.
-            If the user is asking about something unrelated to CRO, websites, UX, or digital marketing, politely redirect them.
-            """
+            # Stream the response from Gemini if the client asked for it
+            if wants_event_stream():
+                return stream_chat_response(stream_chat_reply(model, prompt), history, session_lock)
             
             # Get response from Gemini
-            response = model.generate_content(prompt)
-            response_text = response.text
-            
-            # Check if we need to redirect off-topic conversations
-            off_topic_keywords = ["personal", "politics", "medical advice", "legal advice", "investments", 
-                                 "dating", "games", "movies", "music", "sports", "weather", "news"]
-                                 
-            if any(keyword in user_message.lower() for keyword in off_topic_keywords) and not any(cro_term in user_message.lower() for cro_term in ["website", "conversion", "ux", "ui", "page", "user", "customer", "traffic", "bounce", "cro", "optimization"]):
-                response_text = """I'm sorry, I'm specialized in website conversion rate optimization and can only help with questions related to improving websites, user experience, or digital marketing strategies. 
-
-Could you ask me something about optimizing your website, improving user experience, or increasing conversion rates?"""
+            response_text = generate_chat_reply(model, prompt)
+        
+        # Canned replies are sent as a single event to streaming clients
+        if wants_event_stream():
+            return stream_chat_response([response_text], history, session_lock)
         
         # Add assistant response to history
-        chat_histories[session_id].append({"role": "assistant", "content": response_text})
+        with session_lock:
+            append_chat_message(history, "assistant", response_text)
         
         # Return the chat response
         chat_response = {
             "response": response_text
         }
         
-        response = make_response(jsonify(chat_response))
-        response.set_cookie('session_id', session_id)
-        return response
+        return ojsonify(chat_response)
         
     except Exception as e:
         error_message = str(e)
-        print(f"❌ Error in chat interaction: {error_message}")
+        logger.exception(f"❌ Error in chat interaction: {error_message}")
         
-        response = make_response(jsonify({
+        return ojsonify({
             "error": "Failed to process your question.",
             "response": "I'm having trouble connecting right now. Please try again in a moment."
-        }), 500)
-        response.set_cookie('session_id', session_id)
-        return response
+        }, 500)
 
-# API endpoint to analyze a URL
-@app.route('/api/analyze', methods=['POST'])
-def analyze_url():
-    # Get or create session ID
-    session_id = get_session_id()
-    
-    # Initialize session data
-    if session_id not in session_data:
-        with lock:
-            session_data[session_id] = {'timestamp': time.time()}
-    
-    data = request.get_json(silent=True)
+# Helper function to read the URL to analyze from the request
+def get_request_url():
+    """Get the URL from the JSON body, falling back to form data."""
+    data = json_body()
     
     # Handle case where request might not be JSON
-    if data is None:
-        url = request.form.get('url')
-    else:
-        url = data.get('url')
-    
+    if not isinstance(data, dict):
+        return request.form.get('url')
+    return data.get('url')
+
+# Cheap request checks shared by the synchronous and background analyze paths
+def check_analysis_url(url):
+    """Return an (error_message, status_code) tuple if the URL can't be analyzed, else None."""
     if not url:
-        response = make_response(Response("ERROR: URL is required", mimetype="text/plain; charset=utf-8"), 400)
-        response.set_cookie('session_id', session_id)
-        return response
+        return ("URL is required", 400)
     
     if not GEMINI_API_KEY:
-        response = make_response(Response("ERROR: Gemini API key not configured on server", mimetype="text/plain; charset=utf-8"), 500)
-        response.set_cookie('session_id', session_id)
-        return response
+        return ("Gemini API key not configured on server", 500)
     
     # Validate URL
-    try:
-        result = urlparse(url)
-        if not all([result.scheme, result.netloc]):
-            response = make_response(Response("ERROR: Invalid URL format", mimetype="text/plain; charset=utf-8"), 400)
-            response.set_cookie('session_id', session_id)
-            return response
-    except:
-        response = make_response(Response("ERROR: Invalid URL", mimetype="text/plain; charset=utf-8"), 400)
-        response.set_cookie('session_id', session_id)
-        return response
+    if not is_valid_url(url):
+        return ("Invalid URL format", 400)
+    
+    return None
+
+# Shared pipeline behind the analyze endpoints
+def run_analysis(url, session_id):
+    """
+    Validate, fetch and analyze a URL for a session.
+    Returns (analysis_data, cache_hit, error) where error is None or an (error_message, status_code) tuple.
+    """
+    # Initialize session data
+    session = get_session_data(session_id)
+    
+    error = check_analysis_url(url)
+    if error:
+        return None, False, error
     
     # Store URL in session data
-    session_data[session_id]['url'] = url
+    session['url'] = url
     
-    # Configure Gemini
-    try:
-        model = configure_gemini()
-    except Exception as e:
-        response = make_response(Response(f"ERROR: Failed to configure Gemini API: {str(e)}", mimetype="text/plain; charset=utf-8"), 500)
-        response.set_cookie('session_id', session_id)
-        return response
+    # Serve a recent analysis of the same page from cache
+    cache_key = analysis_cache_key(url)
+    analysis_data = get_cached_analysis(cache_key)
+    if analysis_data is not None:
+        logger.debug(f"🔄 Analysis cache hit for {url}")
+        session['analysis'] = analysis_data
+        return analysis_data, True, None
+    
+    # Open the Gemini connection in the background while the page is fetched
+    if not gemini_warmup_started.is_set():
+        gemini_warmup_started.set()
+        scrape_executor.submit(warm_gemini_connection)
     
     # Extract website content
     website_data, success = extract_website_content(url)
     if not success:
         error_details = website_data.get('error', 'Unknown error')
-        response = make_response(Response(f"ERROR: Failed to extract website content. Details: {error_details}", 
-                        mimetype="text/plain; charset=utf-8"), 500)
-        response.set_cookie('session_id', session_id)
-        return response
+        return None, False, (f"Failed to extract website content: {error_details}", 500)
     
     # Store website data in session
-    session_data[session_id]['website_data'] = website_data
+    session['website_data'] = website_data
     
     # Analyze website
-    analysis_data, success = analyze_website(model, website_data, session_id)
+    analysis_data, success = analyze_website(gemini_model, website_data, session_id)
     if not success:
-        response = make_response(Response(f"ERROR: Failed to analyze website. Please try again later.", 
-                        mimetype="text/plain; charset=utf-8"), 500)
-        response.set_cookie('session_id', session_id)
-        return response
+        return None, False, ("Failed to analyze website. Please try again later.", 500)
     
-    # Format the response
-    response_text = format_response(url, analysis_data)
+    store_cached_analysis(cache_key, analysis_data)
+    return analysis_data, False, None
+
+# Build the analyze endpoints' responses from run_analysis results
+def analysis_text_response(url, analysis_data, cache_hit, error):
+    """Plain-text report (or "ERROR: ..." message) as returned by /api/analyze."""
+    if error:
+        error_message, status_code = error
+        return Response(f"ERROR: {error_message}", status=status_code, mimetype="text/plain; charset=utf-8")
     
     # Return analysis results as plain text with UTF-8 encoding
-    response = make_response(Response(response_text, mimetype="text/plain; charset=utf-8"))
-    response.set_cookie('session_id', session_id)
+    response = Response(format_response(url, analysis_data), mimetype="text/plain; charset=utf-8")
+    response.headers['X-Cache'] = 'HIT' if cache_hit else 'MISS'
     return response
 
-# API endpoint for JSON output
-@app.route('/api/analyze/json', methods=['POST'])
-def analyze_url_json():
-    # Get or create session ID
-    session_id = get_session_id()
-    
-    # Initialize session data
-    if session_id not in session_data:
-        with lock:
-            session_data[session_id] = {'timestamp': time.time()}
+def analysis_json_response(url, analysis_data, cache_hit, error):
+    """JSON analysis (or {"error": ...}) as returned by /api/analyze/json."""
+    if error:
+        error_message, status_code = error
+        return ojsonify({"error": error_message}, status_code)
     
-    data = request.get_json(silent=True)
-    
-    # Handle case where request might not be JSON
-    if data is None:
-        url = request.form.get('url')
-    else:
-        url = data.get('url')
+    # Add URL to the response
+    analysis_data['url'] = url
+    response = ojsonify(analysis_data)
+    response.headers['X-Cache'] = 'HIT' if cache_hit else 'MISS'
+    return response
+
+# Background analysis jobs.
+# Jobs live in this process only, so polling must reach the worker that accepted the job
+# (run a single gunicorn worker, see wsgi.py).
+def wants_async_analysis():
+    """Check whether the client asked for the analysis to run as a background job."""
+    return request.args.get('async') == '1'
+
+def submit_analysis_job(url, session_id, build_response):
+    """Queue run_analysis on the analysis pool and return a 202 response with the job id."""
+    # Reject bad input right away; only the fetch and Gemini work run in the background
+    error = check_analysis_url(url)
+    if error:
+        return build_response(url, None, False, error)
     
-    if not url:
-        response = make_response(jsonify({"error": "URL is required"}), 400)
-        response.set_cookie('session_id', session_id)
-        return response
+    job_id = uuid.uuid4().hex
+    future = analysis_executor.submit(run_analysis, url, session_id)
+    with analysis_jobs_lock:
+        analysis_jobs[job_id] = {'future': future, 'url': url, 'build_response': build_response}
     
-    if not GEMINI_API_KEY:
-        response = make_response(jsonify({"error": "Gemini API key not configured on server"}), 500)
-        response.set_cookie('session_id', session_id)
-        return response
+    response = ojsonify({"job_id": job_id, "status": "pending"}, 202)
+    response.headers['Location'] = f"/api/analyze/result/{job_id}"
+    return response
+
+# API endpoint to analyze a URL
+@app.route('/api/analyze', methods=['POST'])
+def analyze_url():
+    session_id = g.session_id
     
-    # Validate URL
-    try:
-        result = urlparse(url)
-        if not all([result.scheme, result.netloc]):
-            response = make_response(jsonify({"error": "Invalid URL format"}), 400)
-            response.set_cookie('session_id', session_id)
-            return response
-    except:
-        response = make_response(jsonify({"error": "Invalid URL"}), 400)
-        response.set_cookie('session_id', session_id)
-        return response
+    url = get_request_url()
+    if wants_async_analysis():
+        return submit_analysis_job(url, session_id, analysis_text_response)
     
-    # Store URL in session data
-    session_data[session_id]['url'] = url
+    return analysis_text_response(url, *run_analysis(url, session_id))
+
+# API endpoint for JSON output
+@app.route('/api/analyze/json', methods=['POST'])
+def analyze_url_json():
+    session_id = g.session_id
     
-    # Configure Gemini
-    try:
-        model = configure_gemini()
-    except Exception as e:
-        response = make_response(jsonify({"error": f"Failed to configure Gemini API: {str(e)}"}), 500)
-        response.set_cookie('session_id', session_id)
-        return response
+    url = get_request_url()
+    if wants_async_analysis():
+        return submit_analysis_job(url, session_id, analysis_json_response)
     
-    # Extract website content
-    website_data, success = extract_website_content(url)
-    if not success:
-        error_details = website_data.get('error', 'Unknown error')
-        response = make_response(jsonify({"error": f"Failed to extract website content: {error_details}"}), 500)
-        response.set_cookie('session_id', session_id)
-        return response
+    return analysis_json_response(url, *run_analysis(url, session_id))
+
+# Poll a background analysis job started with ?async=1; the finished result matches the submitting endpoint
+@app.route('/api/analyze/result/<job_id>', methods=['GET'])
+def analysis_result(job_id):
+    with analysis_jobs_lock:
+        job = analysis_jobs.get(job_id)
     
-    # Store website data in session
-    session_data[session_id]['website_data'] = website_data
+    if job is None:
+        return ojsonify({"error": "Unknown or expired job"}, 404)
     
-    # Analyze website
-    analysis_data, success = analyze_website(model, website_data, session_id)
-    if not success:
-        response = make_response(jsonify({"error": "Failed to analyze website. Please try again later."}), 500)
-        response.set_cookie('session_id', session_id)
-        return response
+    future = job['future']
+    if not future.done():
+        return ojsonify({"job_id": job_id, "status": "pending"}, 202)
     
-    # Add URL to the response
-    analysis_data['url'] = url
+    try:
+        analysis_data, cache_hit, error = future.result()
+    except Exception as e:
+        logger.exception(f"❌ Error in analysis job {job_id}: {str(e)}")
+        analysis_data, cache_hit, error = None, False, ("Failed to analyze website. Please try again later.", 500)
     
-    # Return JSON response
-    response = make_response(jsonify(analysis_data))
-    response.set_cookie('session_id', session_id)
-    return response
+    return job['build_response'](job['url'], analysis_data, cache_hit, error)
 
 # Status endpoint to check if API is running
 @app.route('/api/status', methods=['GET'])
 def status():
-    # Clean up old sessions
-    cleanup_old_sessions()
-    
     status_text = "CRO Optimizer API Status: Running\nGemini API Configured: " + str(bool(GEMINI_API_KEY))
-    response = make_response(Response(status_text, mimetype="text/plain; charset=utf-8"))
-    
-    # Get or create session ID
-    session_id = get_session_id()
-    response.set_cookie('session_id', session_id)
-    
-    return response
+    return Response(status_text, mimetype="text/plain; charset=utf-8")
+
+# Homepage with basic information, encoded once at import
+HOMEPAGE_HTML = """<html>
+<head>
+    <title>CRO Optimizer API</title>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; max-width: 800px; margin: 0 auto; padding: 20px; }
+        h1 { color: #4A90E2; }
+        .status { padding: 10px; background-color: #E3F2FD; border-radius: 4px; margin-bottom: 20px; }
+        code { background: #f4f4f4; padding: 2px 5px; border-radius: 3px; }
+        pre { background: #f4f4f4; padding: 15px; border-radius: 5px; overflow-x: auto; }
+        .endpoint { margin-bottom: 30px; }
+    </style>
+</head>
+<body>
+    <h1>CRO Optimizer API</h1>
+    <div class="status">✅ CRO Optimizer API with Gemini is running!</div>
+
+    <p>This API analyzes websites and provides feedback on:</p>
+    <ul>
+        <li>Call-to-Action Visibility</li>
+        <li>Form Field Optimization</li>
+        <li>Mobile Navigation Issues</li>
+        <li>Social Proof Placement</li>
+        <li>Page Speed Optimization</li>
+        <li>Content Clarity</li>
+    </ul>
+
+    <div class="endpoint">
+        <h2>Text Response Endpoint</h2>
+        <p>Send a POST request to <code>/api/analyze</code> with a URL to get a text analysis report.</p>
+        <pre>curl -X POST -H "Content-Type: application/json" -d '{"url":"https://example.com"}' http://localhost:5000/api/analyze</pre>
+    </div>
+
+    <div class="endpoint">
+        <h2>JSON Response Endpoint</h2>
+        <p>Send a POST request to <code>/api/analyze/json</code> for a structured JSON response.</p>
+        <pre>curl -X POST -H "Content-Type: application/json" -d '{"url":"https://example.com"}' http://localhost:5000/api/analyze/json</pre>
+    </div>
+
+    <div class="endpoint">
+        <h2>Status Check</h2>
+        <p>Send a GET request to <code>/api/status</code> to check if the API is running.</p>
+        <pre>curl http://localhost:5000/api/status</pre>
+    </div>
+</body>
+</html>
+"""
+HOMEPAGE_BYTES = HOMEPAGE_HTML.encode('utf-8')
+HOMEPAGE_ETAG = hashlib.sha1(HOMEPAGE_BYTES).hexdigest()
 
-# Homepage with basic information
 @app.route('/')
 def home():
-    # Clean up old sessions
-    cleanup_old_sessions()
-    
-    # Get or create session ID
-    session_id = get_session_id()
-    
-    # Initialize session data if needed
-    if session_id not in session_data:
-        with lock:
-            session_data[session_id] = {'timestamp': time.time()}
-    
-    html_response = """
-    <html>
-    <head>
-        <title>CRO Optimizer API</title>
-        <style>
-            body { font-family: Arial, sans-serif; line-height: 1.6; max-width: 800px; margin: 0 auto; padding: 20px; }
-            h1 { color: #4A90E2; }
-            .status { padding: 10px; background-color: #E3F2FD; border-radius: 4px; margin-bottom: 20px; }
-            code { background: #f4f4f4; padding: 2px 5px; border-radius: 3px; }
-            pre { background: #f4f4f4; padding: 15px; border-radius: 5px; overflow-x: auto; }
-            .endpoint { margin-bottom: 30px; }
-        </style>
-    </head>
-    <body>
-        <h1>CRO Optimizer API</h1>
-        <div class="status">✅ CRO Optimizer API with Gemini is running!</div>
-        
-        <p>This API analyzes websites and provides feedback on:</p>
-        <ul>
-            <li>Call-to-Action Visibility</li>
-            <li>Form Field Optimization</li>
-            <li>Mobile Navigation Issues</li>
-            <li>Social Proof Placement</li>
-            <li>Page Speed Optimization</li>
-            <li>Content Clarity</li>
-        </ul>
-        
-        <div class="endpoint">
-            <h2>Text Response Endpoint</h2>
-            <p>Send a POST request to <code>/api/analyze</code> with a URL to get a text analysis report.</p>
-            <pre>curl -X POST -H "Content-Type: application/json" -d '{"url":"https://example.com"}' http://localhost:5000/api/analyze</pre>
-        </div>
-        
-        <div class="endpoint">
-            <h2>JSON Response Endpoint</h2>
-            <p>Send a POST request to <code>/api/analyze/json</code> for a structured JSON response.</p>
-            <pre>curl -X POST -H "Content-Type: application/json" -d '{"url":"https://example.com"}' http://localhost:5000/api/analyze/json</pre>
-        </div>
-        
-        <div class="endpoint">
-            <h2>Status Check</h2>
-            <p>Send a GET request to <code>/api/status</code> to check if the API is running.</p>
-            <pre>curl http://localhost:5000/api/status</pre>
-        </div>
-    </body>
-    </html>
-    """
-    
-    response = make_response(html_response)
-    response.set_cookie('session_id', session_id)
-    return response
+    # Static content: no session is created here, so the page can be cached by clients and proxies
+    response = Response(HOMEPAGE_BYTES, mimetype="text/html",
+                        headers={'Cache-Control': 'public, max-age=3600'})
+    response.set_etag(HOMEPAGE_ETAG)
+    return response.make_conditional(request)
 
 # Serve static files for the React app in production
 @app.route('/<path:path>')
@@ -1027,9 +1375,14 @@ def serve(path):
                    mimetype="text/plain; charset=utf-8")
 
 if __name__ == '__main__':
+    # The Werkzeug server is for local development only; production runs wsgi:application under gunicorn
+    if '--dev' not in sys.argv[1:]:
+        logger.error("🛑 Use 'python app.py --dev' for the development server, or run wsgi:application under gunicorn (see wsgi.py)")
+        sys.exit(1)
+    
     port = int(os.environ.get('PORT', 5000))
-    print(f"🚀 Starting CRO Optimizer API on port {port}...")
+    logger.info(f"🚀 Starting CRO Optimizer API development server on port {port}...")
     try:
-        app.run(host='0.0.0.0', port=port, debug=False)
+        app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
     except Exception as e:
-        print(f"🔥 Error starting Flask: {e}")
+        logger.exception(f"🔥 Error starting Flask: {e}")
@@ -0,0 +1,24 @@
+# Production entry point for the CRO Optimizer API.
+#
+# Requires gevent and gunicorn (not in the bundled venv): pip install gevent gunicorn
+#
+# Run from the backend directory with a single worker:
+#   gunicorn -k gevent -w 1 --worker-connections 1000 --timeout 120 wsgi:application
+#
+# Sessions, chat history, the analysis cache and background analysis jobs all live in
+# process memory, so extra workers would each see only part of that state (chat context
+# is lost and job polling 404s). gevent already multiplexes requests within the one worker;
+# scale out only behind a load balancer with sticky sessions.
+#
+# Patch the standard library before anything imports sockets or threads,
+# so requests/Gemini I/O yields to other greenlets instead of blocking the worker.
+from gevent import monkey
+monkey.patch_all()
+
+# google.generativeai talks to Gemini over gRPC, which only cooperates with gevent once initialised for it
+from grpc.experimental import gevent as grpc_gevent  # noqa: E402
+grpc_gevent.init_gevent()
+
+from app import app  # noqa: E402
+
+application = app